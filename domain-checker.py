@@ -11,9 +11,11 @@ def install_required_packages():
     """Auto-install required packages with uv support"""
     
     required_packages = {
-        'beautifulsoup4': 'bs4',
         'tqdm': 'tqdm', 
         'aiohttp': 'aiohttp',
+        'aiodns': 'aiodns',
+        'uvloop': 'uvloop',
+        'orjson': 'orjson',
         'jinja2': 'jinja2',
         'urllib3': 'urllib3'
     }
@@ -35,36 +37,34 @@ def install_required_packages():
         package_manager = detect_package_manager()
         print(f"📦 Using package manager: {package_manager}")
         
-        for package in missing_packages:
-            try:
-                print(f"Installing {package}...")
-                
-                if package_manager == "uv":
-                    # Use uv add first
-                    result = subprocess.run(["uv", "add", package], 
-                                          capture_output=True, text=True)
-                    if result.returncode != 0:
-                        # If uv add fails, try uv pip
-                        result = subprocess.run(["uv", "pip", "install", package], 
-                                              capture_output=True, text=True)
-                elif package_manager == "pip":
-                    # Use regular pip
-                    result = subprocess.run([sys.executable, "-m", "pip", "install", package, "--quiet"], 
-                                          capture_output=True, text=True)
-                else:
-                    # Fallback to pip
-                    result = subprocess.run([sys.executable, "-m", "pip", "install", package, "--quiet"], 
-                                          capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    print(f"✅ {package} installed successfully")
-                else:
-                    print(f"❌ Failed to install {package}: {result.stderr}")
-                    return False
+        # Install everything in one call to pay interpreter/resolver startup once
+        try:
+            print(f"Installing {', '.join(missing_packages)}...")
+            result = run_install_command(package_manager, missing_packages)
+            batch_installed = result.returncode == 0
+        except Exception as e:
+            print(f"⚠️ Batch installation failed: {e}")
+            batch_installed = False
+        
+        if batch_installed:
+            for package in missing_packages:
+                print(f"✅ {package} installed successfully")
+        else:
+            print("🔄 Falling back to installing packages one by one...")
+            for package in missing_packages:
+                try:
+                    print(f"Installing {package}...")
+                    result = run_install_command(package_manager, [package])
                     
-            except Exception as e:
-                print(f"❌ Failed to install {package}: {e}")
-                return False
+                    if result.returncode == 0:
+                        print(f"✅ {package} installed successfully")
+                    else:
+                        print(f"❌ Failed to install {package}: {result.stderr}")
+                        return False
+                        
+                except Exception as e:
+                    print(f"❌ Failed to install {package}: {e}")
+                    return False
                 
         print("🎉 All packages installed successfully!")
     else:
@@ -72,11 +72,27 @@ def install_required_packages():
     
     return True
 
+def run_install_command(package_manager, packages):
+    """Install the given packages with the detected package manager"""
+    if package_manager == "uv":
+        # Use uv add first
+        result = subprocess.run(["uv", "add", *packages], 
+                              capture_output=True, text=True)
+        if result.returncode != 0:
+            # If uv add fails, try uv pip
+            result = subprocess.run(["uv", "pip", "install", *packages], 
+                                  capture_output=True, text=True)
+    else:
+        # Use regular pip (also the fallback for unknown managers)
+        result = subprocess.run([sys.executable, "-m", "pip", "install", *packages, "--quiet"], 
+                              capture_output=True, text=True)
+    return result
+
 def detect_package_manager():
     """Detect available package manager"""
     try:
         # Check for uv
-        result = subprocess.run(["uv", "--version"], capture_output=True, text=True)
+        result = subprocess.run(["uv", "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         if result.returncode == 0:
             return "uv"
     except FileNotFoundError:
@@ -84,7 +100,8 @@ def detect_package_manager():
     
     try:
         # Check for pip
-        result = subprocess.run([sys.executable, "-m", "pip", "--version"], capture_output=True, text=True)
+        result = subprocess.run([sys.executable, "-m", "pip", "--version"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         if result.returncode == 0:
             return "pip"
     except FileNotFoundError:
@@ -105,16 +122,22 @@ print("\n🔄 Loading modules...")
 
 # Now import the modules
 import os
+import argparse
 import socket
-import json
+import ipaddress
+import time
 import logging
+import logging.handlers
+import queue
+import atexit
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+import aiohttp.abc
+import aiohttp.resolver
+import aiodns
+import orjson
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor
-import multiprocessing
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from jinja2 import Environment, FileSystemLoader
 import urllib3
 
@@ -129,6 +152,26 @@ CPANEL_PATH = "/usr/local/cpanel"
 DIRECTADMIN_PATH = "/usr/local/directadmin"
 TRANSFER_DIR = "/home/transfer"
 USERDATA_DOMAINS_FILE = "/etc/userdatadomains"
+DIRECTADMIN_EXCLUDED_DIRS = frozenset({"sharedip", "suspended", "default"})
+DNS_NAMESERVERS = ["1.1.1.1", "8.8.8.8"]
+DNS_CONCURRENCY = 256  # Keep c-ares below the open file descriptor limit
+DNS_CACHE_TTL = 900  # Seconds a cached DNS answer stays valid
+_DNS_CACHE_MISS = object()  # Distinguishes "not cached" from a cached lookup failure (None)
+CHECK_CONCURRENCY = 500
+AUTOINDEX_PROBE_BYTES = 16384  # The autoindex stylesheet link lives in <head>
+AUTOINDEX_PROBE_HEADERS = {'Range': f'bytes=0-{AUTOINDEX_PROBE_BYTES - 1}'}
+HEAD_TIMEOUT = aiohttp.ClientTimeout(total=5, sock_connect=3)
+STATUS_CLASSES = {
+    "Direct": "direct",
+    "Healthy": "healthy",
+    "Mismatched": "mismatched",
+    "No Ping": "no-ping"
+}
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15, sock_connect=3, sock_read=7)
+MAX_REDIRECTS = 3
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
 
 # Logging setup
 logging.basicConfig(
@@ -154,6 +197,17 @@ status_handler.setFormatter(status_format)
 status_logger.addHandler(status_handler)
 status_logger.propagate = False
 
+def queue_logger(logger: logging.Logger):
+    """Put a logger's handlers behind a queue so logging calls never block on file I/O"""
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+
+for logger in (logging.getLogger(), error_logger, status_logger):
+    queue_logger(logger)
+
 # Jinja2 setup for HTML report
 env = Environment(loader=FileSystemLoader('.'))
 template = env.from_string("""
@@ -182,8 +236,8 @@ template = env.from_string("""
             <th>IP</th>
             <th>HTTP Status</th>
         </tr>
-        {% for domain, status, ip, http_status in domains %}
-        <tr class="{{ status|lower|replace(' ', '-') }}">
+        {% for domain, status, ip, http_status, css_class in domains %}
+        <tr class="{{ css_class }}">
             <td>{{ domain }}</td>
             <td>{{ status }}</td>
             <td>{{ ip or 'N/A' }}</td>
@@ -195,13 +249,70 @@ template = env.from_string("""
 </html>
 """)
 
+_session: Optional[aiohttp.ClientSession] = None
+
+def get_session(resolver: Optional[aiohttp.abc.AbstractResolver] = None) -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use with the given resolver"""
+    global _session
+    if _session is None or _session.closed:
+        # No per-host cap: parked and alias domains often redirect to one shared
+        # host, and a cap would queue them all behind each other. The global
+        # limit is raised above CHECK_CONCURRENCY instead of the default 100
+        connector = aiohttp.TCPConnector(
+            limit=1000,
+            enable_cleanup_closed=True,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            resolver=resolver or aiohttp.resolver.AsyncResolver(),
+            ssl=False
+        )
+        _session = aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT, headers=DEFAULT_HEADERS)
+    return _session
+
+async def read_prefix(response: aiohttp.ClientResponse, limit: int) -> bytes:
+    """Read at most `limit` bytes of the response body"""
+    data = b""
+    while len(data) < limit:
+        chunk = await response.content.read(limit - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+class CachedResolver(aiohttp.resolver.AsyncResolver):
+    """aiohttp resolver that reuses the answers DomainManager already looked up"""
+
+    def __init__(self, domain_manager: "DomainManager"):
+        super().__init__()
+        self.domain_manager = domain_manager
+
+    async def resolve(self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET):
+        ip = self.domain_manager.get_cached_ip(host)
+        if ip is None:
+            return await super().resolve(host, port, family)
+        return [{
+            "hostname": host, "host": ip, "port": port,
+            "family": socket.AF_INET, "proto": 0, "flags": socket.AI_NUMERICHOST
+        }]
+
 class DomainManager:
-    def __init__(self):
+    def __init__(self, nameservers: Optional[List[str]] = None, dns_concurrency: int = DNS_CONCURRENCY):
         self.transfer_dir = self.create_transfer_directory()
         self.server_ip = self.get_server_ip()
+        # Public resolvers report what the rest of the world sees, and c-ares
+        # pipelines all queries over a few shared UDP sockets
+        self.resolver = aiodns.DNSResolver(nameservers=nameservers or DNS_NAMESERVERS, timeout=2, tries=1)
+        self.dns_semaphore = asyncio.Semaphore(dns_concurrency)
+        self._dns_cache: Dict[str, Tuple[Optional[str], float]] = {}
         self.panel_type = self.check_control_panel()
         self.domains = []
         self.domain_paths = self.get_domains()
+        # Addon/parked entries can repeat a domain; keep the first occurrence only
+        self.domains = list(dict.fromkeys(self.domains))
+        self.domain_path_map = {}
+        for domain, path in self.domain_paths:
+            self.domain_path_map.setdefault(domain, path)
+        self.domain_paths = list(self.domain_path_map.items())
 
     def check_control_panel(self) -> str:
         if os.path.exists(CPANEL_PATH):
@@ -238,10 +349,16 @@ class DomainManager:
     def get_cpanel_domains(self) -> List[Tuple[str, Optional[str]]]:
         try:
             command = ["whmapi1", "--output=jsonpretty", "get_domain_info"]
-            result = subprocess.run(command, stdout=subprocess.PIPE, universal_newlines=True, check=True)
-            output_json = json.loads(result.stdout)
-            self.domains = [entry["domain"] for entry in output_json["data"]["domains"] if "domain" in entry]
-            return [(domain, self.get_cpanel_domain_path(domain)) for domain in self.domains]
+            result = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+            output_json = orjson.loads(result.stdout)
+            docroots = self._parse_userdatadomains()
+            domain_paths = []
+            for entry in output_json["data"]["domains"]:
+                domain = entry.get("domain")
+                if domain:
+                    self.domains.append(domain)
+                    domain_paths.append((domain, docroots.get(domain)))
+            return domain_paths
         except subprocess.CalledProcessError as e:
             error_logger.error(f"Error running WHM API command: {e}")
             return []
@@ -249,75 +366,109 @@ class DomainManager:
             error_logger.error(f"Error extracting domains from cPanel: {e}")
             return []
 
-    def get_cpanel_domain_path(self, domain: str) -> Optional[str]:
+    def _parse_userdatadomains(self) -> Dict[str, str]:
+        # Lines look like "domain: user==owner==type==parent==docroot==..."
+        paths = {}
         try:
             with open(USERDATA_DOMAINS_FILE, "r") as file:
-                lines = file.readlines()
-            for line in lines:
-                if line.startswith(domain):
+                for line in file:
                     parts = line.split("==")
                     if len(parts) > 4:
-                        return parts[4].strip()
-            return None
+                        paths[parts[0].split(":", 1)[0].strip()] = parts[4].strip()
         except FileNotFoundError:
             error_logger.error(f"{USERDATA_DOMAINS_FILE} file not found.")
-            return None
         except Exception as e:
-            error_logger.error(f"Error finding path for {domain} in cPanel: {e}")
-            return None
+            error_logger.error(f"Error parsing {USERDATA_DOMAINS_FILE}: {e}")
+        return paths
 
     def get_directadmin_domains(self) -> List[Tuple[str, str]]:
         domain_paths = []
         try:
-            for user_dir in os.listdir("/home"):
-                domain_root = f"/home/{user_dir}/domains"
-                if os.path.exists(domain_root):
-                    for domain in os.listdir(domain_root):
-                        if domain not in ["sharedip", "suspended", "default"]:
-                            domain_paths.append((domain, os.path.join(domain_root, domain, "public_html")))
-                            self.domains.append(domain)
+            with os.scandir("/home") as users:
+                # Home and domain directories may be symlinks to other volumes (e.g. /home2/<user>)
+                user_dirs = [user.path for user in users if user.is_dir()]
+            for user_dir in user_dirs:
+                domain_root = os.path.join(user_dir, "domains")
+                try:
+                    with os.scandir(domain_root) as entries:
+                        for entry in entries:
+                            if entry.name not in DIRECTADMIN_EXCLUDED_DIRS and entry.is_dir():
+                                domain_paths.append((entry.name, os.path.join(entry.path, "public_html")))
+                                self.domains.append(entry.name)
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
             return domain_paths
         except Exception as e:
             error_logger.error(f"Error extracting domains and paths from DirectAdmin: {e}")
             return []
 
     def get_domain_path(self, domain: str) -> Optional[str]:
-        for d, path in self.domain_paths:
-            if d == domain:
-                return path
-        return None
+        return self.domain_path_map.get(domain)
+
+    def _lookup_dns_cache(self, domain: str):
+        """Return the cached IP (None for a cached failure) or _DNS_CACHE_MISS if absent or expired"""
+        cached = self._dns_cache.get(domain)
+        if cached and time.monotonic() - cached[1] < DNS_CACHE_TTL:
+            return cached[0]
+        return _DNS_CACHE_MISS
 
-    def get_domain_ip(self, domain: str) -> Optional[str]:
+    def get_cached_ip(self, domain: str) -> Optional[str]:
+        ip = self._lookup_dns_cache(domain)
+        return None if ip is _DNS_CACHE_MISS else ip
+
+    async def get_domain_ip(self, domain: str) -> Optional[str]:
+        # IPv4 only, matching the AF_INET resolver; IPv6 would also need [..] in URLs
         try:
-            return socket.gethostbyname(domain)
-        except socket.gaierror:
-            error_logger.error(f"Error resolving domain {domain}")
-            return None
+            return str(ipaddress.IPv4Address(domain))
+        except ValueError:
+            pass
+        ip = self._lookup_dns_cache(domain)
+        if ip is not _DNS_CACHE_MISS:
+            return ip
+        async with self.dns_semaphore:
+            try:
+                result = await self.resolver.getaddrinfo(domain, family=socket.AF_INET)
+                ip = result.nodes[0].addr[0].decode() if result.nodes else None
+            except (aiodns.error.DNSError, socket.gaierror) as e:
+                error_logger.error(f"Error resolving domain {domain}: {e}")
+                ip = None
+        self._dns_cache[domain] = (ip, time.monotonic())
+        return ip
 
     async def check_status(self, domain: str, session: aiohttp.ClientSession) -> Optional[str]:
         try:
             url = f"http://{domain}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            async with session.get(url, headers=headers, timeout=15, ssl=False) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    soup = BeautifulSoup(text, 'html.parser')
-                    for link in soup.find_all('link', href=True):
-                        if 'autoindex.css' in link['href']:
-                            return "index of"
-                    return str(response.status)
-                else:
-                    return str(response.status)
+            async with session.head(url, allow_redirects=True, max_redirects=MAX_REDIRECTS,
+                                    timeout=HEAD_TIMEOUT) as response:
+                status = response.status
+                content_type = response.headers.get('Content-Type', '')
+            if status in (405, 501):
+                # HEAD is not supported here, so let a plain GET decide the status
+                async with session.get(url, max_redirects=MAX_REDIRECTS) as response:
+                    status = response.status
+                    head = await read_prefix(response, AUTOINDEX_PROBE_BYTES) if status == 200 else b""
+            elif status == 200:
+                if content_type and 'html' not in content_type:
+                    # Directory listings are always HTML
+                    return str(status)
+                async with session.get(url, headers=AUTOINDEX_PROBE_HEADERS, max_redirects=MAX_REDIRECTS) as response:
+                    head = await read_prefix(response, AUTOINDEX_PROBE_BYTES)
+            else:
+                return str(status)
+            if b'autoindex.css' in head:
+                return "index of"
+            return str(status)
+        except aiohttp.TooManyRedirects:
+            error_logger.error(f"Error checking status for {domain}: more than {MAX_REDIRECTS} redirects")
+            return None
         except Exception as e:
             error_logger.error(f"Error checking status for {domain}: {e}")
             return None
 
     def save_domains_to_file(self, domains: List[str], file_path: str):
         try:
-            with open(file_path, "w") as file:
-                file.writelines(f"{domain}\n" for domain in domains)
+            with open(file_path, "wb") as file:
+                file.write(("\n".join(domains) + "\n").encode() if domains else b"")
             logging.info(f"Domains successfully saved to {file_path}.")
         except Exception as e:
             error_logger.error(f"Error saving domains to file {file_path}: {e}")
@@ -329,86 +480,73 @@ class DomainStatusChecker:
         self.healthy_domains = []
         self.direct_domains = []
         self.no_ping_domains = []
-        self.domain_statuses = []
-
-    def check_domains(self):
-        max_workers = max(2, multiprocessing.cpu_count())  # Dynamic thread count
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self.check_single_domain, domain): domain
-                for domain in self.domain_manager.domains
-            }
-            for future in tqdm(futures, desc="Checking domains"):
-                domain = futures[future]
-                try:
-                    future.result()
-                except Exception as e:
-                    error_logger.error(f"Error checking domain {domain}: {e}")
-
-    def check_single_domain(self, domain: str):
-        domain_ip = self.domain_manager.get_domain_ip(domain)
+        self.status_by_domain: Dict[str, dict] = {}
+
+    async def process_domain(self, domain: str, session: aiohttp.ClientSession):
+        domain_ip = await self.domain_manager.get_domain_ip(domain)
+        status = await self.check_single_domain(domain, domain_ip, session)
+        entry = self.status_by_domain[domain] = {'status': status, 'ip': domain_ip, 'http': None}
+        if status in ("Direct", "Healthy"):
+            entry['http'] = await self.domain_manager.check_status(domain, session)
+            status_logger.info(f"Status for {domain}: {entry['http']}")
+
+    async def check_single_domain(self, domain: str, domain_ip: Optional[str],
+                                  session: aiohttp.ClientSession) -> str:
         if domain_ip:
             logging.info(f"Domain: {domain}, Domain IP: {domain_ip}")
             if domain_ip == self.domain_manager.server_ip:
                 logging.info(f"Domain {domain} is directly on the server.")
                 self.direct_domains.append(domain)
-                self.domain_statuses.append((domain, "Direct", domain_ip, None))
+                return "Direct"
             else:
                 logging.info(f"IP mismatch for {domain}.")
                 domain_path = self.domain_manager.get_domain_path(domain)
-                if self.save_file_and_upload(domain, domain_path):
+                if await self.upload_mismatch_file(domain, domain_path, session):
                     self.healthy_domains.append(domain)
-                    self.domain_statuses.append((domain, "Healthy", domain_ip, None))
+                    return "Healthy"
                 else:
                     self.mismatched_domains.append(domain)
-                    self.domain_statuses.append((domain, "Mismatched", domain_ip, None))
+                    return "Mismatched"
         else:
             logging.info(f"Domain {domain} cannot be pinged.")
             self.no_ping_domains.append(domain)
-            self.domain_statuses.append((domain, "No Ping", None, None))
+            return "No Ping"
 
-    def save_file_and_upload(self, domain: str, domain_path: Optional[str]) -> bool:
-        if domain_path and os.path.exists(domain_path):
-            file_path = os.path.join(domain_path, "mismatch.txt")
+    async def upload_mismatch_file(self, domain: str, domain_path: Optional[str],
+                                   session: aiohttp.ClientSession) -> bool:
+        loop = asyncio.get_running_loop()
+        if domain_path and await loop.run_in_executor(None, os.path.exists, domain_path):
+            body = f"IP mismatch for {domain}\n".encode()
             try:
-                with open(file_path, "w") as file:
-                    file.write(f"IP mismatch for {domain}\n")
-                logging.info(f"File mismatch.txt created in {domain_path} for {domain}.")
-
-                curl_command = ["curl", "-T", file_path, f"http://{domain}/mismatch.txt"]
-                result = subprocess.run(curl_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                if result.returncode == 0:
-                    logging.info(f"File mismatch.txt successfully uploaded for {domain}.")
-                    os.remove(file_path)
-                    return True
-                else:
-                    error_logger.error(f"Failed to upload mismatch.txt via curl for {domain}.")
-                    os.remove(file_path)
+                async with session.put(f"http://{domain}/mismatch.txt", data=body) as response:
+                    if response.status < 400:
+                        logging.info(f"File mismatch.txt successfully uploaded for {domain}.")
+                        return True
+                    error_logger.error(f"Failed to upload mismatch.txt for {domain}: HTTP {response.status}")
                     return False
             except Exception as e:
-                error_logger.error(f"Error creating or uploading file for {domain}: {e}")
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+                error_logger.error(f"Error uploading mismatch.txt for {domain}: {e}")
                 return False
         else:
             error_logger.error(f"Domain path for {domain} not found or doesn't exist.")
             return False
 
     async def check_domain_statuses(self):
-        async with aiohttp.ClientSession() as session:
-            tasks = [
-                self.domain_manager.check_status(domain, session)
-                for domain in self.direct_domains + self.healthy_domains
-            ]
-            results = []
-            for future in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Checking domain statuses"):
-                result = await future
-                results.append(result)
-            for domain, status in zip(self.direct_domains + self.healthy_domains, results):
-                for i, (d, s, ip, _) in enumerate(self.domain_statuses):
-                    if d == domain:
-                        self.domain_statuses[i] = (d, s, ip, status)
-                        status_logger.info(f"Status for {domain}: {status}")
+        domains = self.domain_manager.domains
+        pending = iter(domains)
+        async with get_session(CachedResolver(self.domain_manager)) as session:
+            with tqdm(total=len(domains), desc="Checking domains") as progress:
+                # Workers pull from a shared iterator, so only CHECK_CONCURRENCY
+                # tasks exist at once no matter how many domains there are
+                async def worker():
+                    for domain in pending:
+                        try:
+                            await self.process_domain(domain, session)
+                        except Exception as e:
+                            error_logger.error(f"Error checking domain {domain}: {e}")
+                        progress.update(1)
+
+                await asyncio.gather(*(worker() for _ in range(min(CHECK_CONCURRENCY, len(domains)))))
 
     def save_results(self):
         transfer_dir = self.domain_manager.transfer_dir
@@ -417,23 +555,41 @@ class DomainStatusChecker:
         self.domain_manager.save_domains_to_file(self.direct_domains, os.path.join(transfer_dir, "direct_domains.txt"))
         self.domain_manager.save_domains_to_file(self.no_ping_domains, os.path.join(transfer_dir, "no_ping_domains.txt"))
 
-        combined_domains = self.direct_domains + self.healthy_domains
+        combined_domains = list(dict.fromkeys(self.direct_domains + self.healthy_domains))
         combined_file_path = os.path.join(transfer_dir, "combined_domains.txt")
         self.domain_manager.save_domains_to_file(combined_domains, combined_file_path)
 
         # Generate HTML report
         try:
-            html_content = template.render(domains=self.domain_statuses)
+            rows = (
+                (domain, entry['status'], entry['ip'], entry['http'], STATUS_CLASSES[entry['status']])
+                for domain, entry in self.status_by_domain.items()
+            )
             report_path = os.path.join(transfer_dir, "domain_report.html")
-            with open(report_path, "w") as f:
-                f.write(html_content)
+            with open(report_path, "w", buffering=1 << 20) as f:
+                template.stream(domains=rows).dump(f)
             logging.info(f"HTML report saved to {report_path}.")
         except Exception as e:
             error_logger.error(f"Error generating HTML report: {e}")
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check whether hosted domains point to this server")
+    parser.add_argument("--dns-server", action="append", dest="dns_servers", metavar="IP",
+                        help=f"DNS server to query, may be repeated (default: {', '.join(DNS_NAMESERVERS)})")
+    parser.add_argument("--dns-concurrency", type=positive_int, default=DNS_CONCURRENCY,
+                        help=f"Maximum number of concurrent DNS queries (default: {DNS_CONCURRENCY})")
+    return parser.parse_args()
+
 async def main():
+    args = parse_args()
     print("\n🚀 Starting Domain Status Checker...")
-    domain_manager = DomainManager()
+    domain_manager = DomainManager(nameservers=args.dns_servers, dns_concurrency=args.dns_concurrency)
     if not domain_manager.domain_paths:
         error_logger.error("No domains were found.")
         print("❌ No domains were found.")
@@ -444,7 +600,6 @@ async def main():
     print(f"🎛️  Control Panel: {domain_manager.panel_type}")
 
     status_checker = DomainStatusChecker(domain_manager)
-    status_checker.check_domains()
     await status_checker.check_domain_statuses()
     status_checker.save_results()
 
@@ -466,4 +621,15 @@ async def main():
     print("   - combined_domains.txt")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop_run = getattr(uvloop, "run", None)
+        if uvloop_run is not None:
+            uvloop_run(main())
+        else:
+            # uvloop < 0.18 (e.g. on Python 3.7) has no run(); install its policy instead
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            asyncio.run(main())